@@ -1,29 +1,50 @@
-from jose import jwt, JWTError
+import hashlib
+import time
+from functools import lru_cache
+import jwt
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from typing import List
-from ..services.database import get_db
-from .config import get_settings
-from .security import ALGORITHM
-settings = get_settings()
+from typing import Iterable
+from ..services.users import find_active_user
+from .security import ALGORITHM, JWT_KEY
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+# verified payloads keyed by a digest of the raw token (never the token itself);
+# ttl stays well below jwt_access_expires and `exp` is re-checked on every hit
+_jwt_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+# user_id → {_id, role, active}; role/deactivation changes apply within the ttl
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+def _decode(token: str) -> dict:
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _jwt_cache.get(key)
+    if payload is not None and payload["exp"] > time.time():
+        return payload
+    payload = jwt.decode(token, JWT_KEY, algorithms=[ALGORITHM], options={"require": ["exp", "sub"]})
+    _jwt_cache[key] = payload
+    return payload
 async def get_current_user(token: str = Depends(oauth2_scheme)):
-    db = get_db()
     exc = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials",
                         headers={"WWW-Authenticate": "Bearer"})
     try:
-        payload = jwt.decode(token, settings.jwt_secret, algorithms=[ALGORITHM])
+        payload = _decode(token)
         user_id = payload.get("sub")
-        if not user_id:
+        if not user_id or payload.get("type") == "refresh":
             raise exc
-    except JWTError:
-        raise exc
-    user = await db.users.find_one({"_id": user_id, "active": True})
-    if not user:
+    except jwt.PyJWTError:
         raise exc
+    user = _user_cache.get(user_id)
+    if user is None:
+        user = await find_active_user(user_id, projection={"role": 1, "active": 1})
+        if not user:
+            raise exc
+        _user_cache[user_id] = user
     return user
 class RoleChecker:
-    def __init__(self, roles: List[str]): self.roles = roles
+    def __init__(self, roles: Iterable[str]): self.roles = frozenset(roles)
     async def __call__(self, user=Depends(get_current_user)):
         if user["role"] not in self.roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+@lru_cache(maxsize=32)
+def role_checker(roles: frozenset[str]) -> RoleChecker:
+    """Shared RoleChecker per role-set – same dependency identity in every router."""
+    return RoleChecker(roles)
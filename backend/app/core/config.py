@@ -1,5 +1,5 @@
 from functools import lru_cache
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, MongoDsn
 class Settings(BaseSettings):
     mongo_uri: MongoDsn = "mongodb://mongo:27017/vspp"
@@ -17,6 +17,11 @@ class Settings(BaseSettings):
     smtp_user: str
     smtp_pass: str
     smtp_from: str = "noreply@vspp.com"
-    class Config: env_file = ".env"
+    sync_poll_interval: int = 300
+    # changing it re-hashes a user's password on their next login; until every account has
+    # logged in once, unknown e-mails and old hashes differ in cost (a login timing leak)
+    bcrypt_rounds: int = Field(12, ge=4, le=31)
+    # frozen → hashable, read-only; unknown .env keys are ignored instead of rejected
+    model_config = SettingsConfigDict(env_file=".env", frozen=True, extra="ignore")
 @lru_cache
 def get_settings() -> Settings: return Settings()
@@ -1,13 +1,28 @@
-from datetime import datetime, timedelta
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
-from jose import jwt
-from passlib.context import CryptContext
+import bcrypt
+import jwt
 from .config import get_settings
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 ALGORITHM = "HS256"
 _settings = get_settings()
-def hash_password(p: str) -> str: return pwd_context.hash(p)
-def verify_password(p: str, h: str) -> bool: return pwd_context.verify(p, h)
+JWT_KEY = _settings.jwt_secret.encode()   # HMAC key bytes – encoded once, shared by encode/decode
+# one cost per deployment (12 = what passlib wrote): hashes and the dummy hash
+# used for unknown e-mails must cost the same, or login timing leaks who exists
+_ROUNDS = _settings.bcrypt_rounds
+# direct bcrypt – no passlib scheme detection / deprecation checks per call;
+# existing passlib "$2b$" hashes verify unchanged
+def hash_password(p: str) -> str: return bcrypt.hashpw(p.encode(), bcrypt.gensalt(rounds=_ROUNDS)).decode()
+def verify_password(p: str, h: str) -> bool: return bcrypt.checkpw(p.encode(), h.encode())
+def needs_rehash(h: str) -> bool: return int(h[4:6]) != _ROUNDS   # "$2b$12$…" – cost sits at [4:6]
+# bcrypt is CPU-bound (~100-300 ms) – async callers must not run it on the event loop;
+# own bounded pool so a login burst can't exhaust anyio's threads shared with sync routes
+_CRYPTO_POOL = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 2), thread_name_prefix="crypto")
+async def ahash_password(p: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_CRYPTO_POOL, hash_password, p)
+async def averify_password(p: str, h: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(_CRYPTO_POOL, verify_password, p, h)
 def create_token(sub: str, role: str, exp: int) -> str:
-    return jwt.encode({"sub": sub, "role": role, "exp": datetime.utcnow() + timedelta(seconds=exp)},
-                      _settings.jwt_secret, algorithm=ALGORITHM)
+    return jwt.encode({"sub": sub, "role": role, "exp": int(time.time()) + exp}, JWT_KEY, algorithm=ALGORITHM)
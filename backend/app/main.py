@@ -1,15 +1,34 @@
 from fastapi import FastAPI
 import asyncio
+import logging
 
 from .routers import api_router          # all your sub-routers live here
+from .services.ado_client import aclose_clients
+from .services.database import ensure_indexes
 from .services.sync_daemon import run_sync_loop
 
 app = FastAPI(title="VSPP-ADO Sync Platform")
+log = logging.getLogger("uvicorn.error")
 
 # ⚠️  no global “/api” prefix – nginx already took it away
 app.include_router(api_router)
 
+# event loop -----------------------------------------------------------
+@app.on_event("startup")
+async def _log_loop() -> None:           # expect "Loop" (uvloop) in production
+    log.info("event loop: %s", asyncio.get_running_loop().__class__.__name__)
+
+# mongo indexes --------------------------------------------------------
+@app.on_event("startup")
+async def _ensure_indexes() -> None:
+    await ensure_indexes()
+
 # background sync loop -------------------------------------------------
 @app.on_event("startup")
 async def _start_sync() -> None:         # fire-and-forget task
     asyncio.create_task(run_sync_loop())
+
+
+@app.on_event("shutdown")
+async def _close_ado_clients() -> None:  # drop pooled ADO connections
+    await aclose_clients()
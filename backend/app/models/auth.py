@@ -12,3 +12,9 @@ class LoginRequest(BaseModel):
     email: EmailStr
     password: str = Field(..., min_length=8)
 
+
+class RefreshRequest(BaseModel):
+    """
+    Payload expected by POST /auth/refresh
+    """
+    refresh_token: str
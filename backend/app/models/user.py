@@ -1,14 +1,14 @@
 from datetime import datetime
+from typing import Literal
 from pydantic import BaseModel, EmailStr, Field
 
+# Literal → pydantic checks set membership, no regex engine on the hot path
+RoleT = Literal["Admin", "TechM PM", "MK PM", "Presales", "Viewer"]
+
 class UserBase(BaseModel):
     email: EmailStr
     name: str = Field(..., max_length=80)
-    # pydantic-2.x → use `pattern=` instead of `regex=`
-    role: str = Field(
-        ...,
-        pattern=r"^(Admin|TechM PM|MK PM|Presales|Viewer)$"
-    )
+    role: RoleT
 
 class UserCreate(UserBase):
     password: str = Field(..., min_length=8)
@@ -17,6 +17,8 @@ class UserOut(UserBase):
     id: str
     created_at: datetime
     active: bool = True
+    # bumped on logout, embedded in refresh-tokens – internal, never serialised
+    token_version: int = Field(0, exclude=True)
 
 class Token(BaseModel):
     access_token: str
@@ -3,27 +3,28 @@
 # Central authentication routes:
 #   • POST /auth/register – JSON body → create user
 #   • POST /auth/login    – x-www-form-urlencoded body (OAuth2 pwd-grant) → JWT pair
+#   • POST /auth/refresh  – JSON body {refresh_token} → fresh JWT pair
+#   • POST /auth/logout   – bearer token → revoke all refresh-tokens of the user
 #
 # The module relies on small helper-functions that live in
 # backend/app/services/users.py – keep that service thin so we can
 # swap the persistence layer (Motor → SQLModel, etc.) without ever
 # touching the API surface.
 
-from datetime import timedelta
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from ..core.config import get_settings
+from ..core.auth import get_current_user
+from ..models.auth import RefreshRequest
 from ..models.user import UserCreate, UserOut, Token
 from ..services.users import (
     create_user,           # async def create_user(data: UserCreate) -> UserOut
     authenticate_user,     # async def authenticate_user(username, password) -> UserOut | None
-    create_access_token,   # def  create_access_token(claims: dict, expires: int) -> str
-    create_refresh_token,  # def  create_refresh_token(claims: dict, expires: int) -> str
+    create_tokens,         # def  create_tokens(user: UserOut) -> Token
+    refresh_tokens,        # async def refresh_tokens(refresh_token: str) -> Token | None
+    revoke_tokens,         # async def revoke_tokens(user_id) -> None
 )
 
-settings = get_settings()
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
@@ -71,18 +72,40 @@ async def login(form: OAuth2PasswordRequestForm = Depends()) -> Token:
             detail="Incorrect username or password",
         )
 
-    access_token = create_access_token(
-        {"sub": str(user.id)},
-        expires=settings.jwt_access_expires,
-    )
-    refresh_token = create_refresh_token(
-        {"sub": str(user.id)},
-        expires=settings.jwt_refresh_expires,
-    )
-
-    return Token(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        expires_in=settings.jwt_access_expires,
-    )
+    return create_tokens(user)
+
+
+# ───────────────────────────── refresh ───────────────────────────────
+@router.post(
+    "/refresh",
+    response_model=Token,
+    summary="Exchange a refresh-token for a new token pair",
+)
+async def refresh(payload: RefreshRequest) -> Token:
+    """
+    Refresh-tokens are stateless JWTs – nothing is kept in process memory,
+    so any worker can serve this. Tokens issued before the user's last
+    logout are rejected.
+    """
+    tokens = await refresh_tokens(payload.refresh_token)
+    if tokens is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or revoked refresh token",
+        )
+    return tokens
+
+
+# ───────────────────────────── logout ────────────────────────────────
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Revoke every outstanding refresh-token of the caller",
+)
+async def logout(user: dict = Depends(get_current_user)) -> None:
+    """
+    Bumps the user's `token_version`; access-tokens simply run out
+    (they are short-lived), refresh-tokens stop working immediately.
+    """
+    await revoke_tokens(user["_id"])
 
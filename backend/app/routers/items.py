@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends
 from typing import List
-from ..core.auth import RoleChecker
+from ..core.auth import role_checker
 from ..services.database import get_db
 router = APIRouter(prefix="/items", tags=["items"])
-pm = RoleChecker(["TechM PM","MK PM","Admin","Presales","Viewer"])
+pm = role_checker(frozenset({"TechM PM","MK PM","Admin","Presales","Viewer"}))
 @router.get("/mk/feature-requests", dependencies=[Depends(pm)])
 async def list_fr() -> List[dict]:
     db=get_db()
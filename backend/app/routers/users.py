@@ -1,18 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException
 from datetime import datetime
-from ..core.auth import RoleChecker
-from ..core.security import hash_password
+from pymongo.errors import DuplicateKeyError
+from ..core.auth import role_checker
+from ..core.security import ahash_password
 from ..models.user import UserCreate, UserOut
 from ..services.database import get_db
-admin = RoleChecker(["Admin"])
+admin = role_checker(frozenset({"Admin"}))
 router = APIRouter(prefix="/users", tags=["users"])
 @router.get("/", response_model=list[UserOut], dependencies=[Depends(admin)])
 async def users():
-    db=get_db(); return [{**u,"id":u["_id"]} async for u in db.users.find()]
+    # rename _id → id server-side; password hashes never leave Mongo
+    db=get_db()
+    pipeline=[{"$project":{"_id":0,"id":{"$toString":"$_id"},
+                           "email":1,"name":1,"role":1,"created_at":1,"active":1}}]
+    return await db.users.aggregate(pipeline).to_list(length=None)
 @router.post("/", response_model=dict, dependencies=[Depends(admin)])
 async def create(u: UserCreate):
     db=get_db()
-    if await db.users.find_one({"email":u.email}): raise HTTPException(400,"Email exists")
-    await db.users.insert_one({"_id":u.email,"email":u.email,"name":u.name,"role":u.role,
-                               "password_hash":hash_password(u.password),"created_at":datetime.utcnow(),"active":True})
+    try: await db.users.insert_one({"_id":u.email,"email":u.email,"name":u.name,"role":u.role,
+                                    "password_hash":await ahash_password(u.password),"created_at":datetime.utcnow(),"active":True})
+    except DuplicateKeyError: raise HTTPException(400,"Email exists") from None
     return {"msg":"created"}
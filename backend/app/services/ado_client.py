@@ -2,13 +2,20 @@
 ado_client.py – async helper for Azure DevOps REST
 
 • Handles robust HTTP retries with exponential back-off.
-• Supports WIQL pagination (continuationToken) so we never
-  blow request-length limits.
-• Bulk-fetches work-item payloads in chunks (≤ 200 IDs).
+• Pages WIQL results by ID (`[System.Id] > last`, `$top` per page) –
+  a WIQL response has no continuationToken and is capped at 20 000 IDs.
+• Bulk-fetches work-item payloads in chunks (≤ 200 IDs), several
+  chunks in flight at once over one HTTP/2 connection.
+• One long-lived client per ADO organisation, so sync cycles reuse
+  warm TLS connections (closed by `aclose_clients()` on shutdown).
 • Two public helpers:
-      ‣ fetch_mk_feature_requests(states: list[str] | None)
-      ‣ fetch_tm_epics(states: list[str] | None)
-  … both return a list[dict] containing the full ADO JSON.
+      ‣ fetch_mk_feature_requests(states: list[str] | None, changed_since: datetime | None)
+      ‣ fetch_tm_epics(states: list[str] | None, changed_since: datetime | None)
+  … both are async generators yielding `(cursor, docs)` batches of ADO
+  JSON as they arrive (nothing is materialised up-front). By default only
+  SYNC_FIELDS are requested; pass fields=None for the full `$expand=all` doc.
+  Pass *changed_since* (a watermark) to get only items changed since then,
+  and a stored *cursor* as `after_id` to continue an interrupted pass.
 """
 
 from __future__ import annotations
@@ -16,34 +23,68 @@ from __future__ import annotations
 import asyncio
 import random
 import time
-from typing import AsyncIterator, Sequence
+from base64 import b64encode
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import AsyncIterator, Mapping, Sequence
 
 import httpx
+import orjson
 from httpx import Response
 
 from ..core.config import get_settings
 
 # ───────────────────────── constants ──────────────────────────
 _API_VER = "7.1"
-_ID_PAGE_SIZE = 200            # page size for WIQL ID fetch
 _BATCH_CHUNK = 190             # <=200 ids/query is ADO limit - small margin
+_ID_PAGE_SIZE = 1000           # WIQL `$top` per ID page – well under ADO's 20 000 cap
 _MAX_RETRIES = 5
+_MAX_CONCURRENCY = 8           # parallel work-item GETs per org – stay clear of ADO 429s
 _TRANSIENT = {429, 500, 502, 503, 504}
-
-settings = get_settings()
+_MAX_BACKOFF = 30.0            # seconds – cap of the back-off window
+_WIQL_TMPL = "SELECT [System.Id] FROM WorkItems WHERE {where} ORDER BY [System.Id] ASC"
+# states a caller may filter on (MK custom + stock Agile/Scrum/CMMI/Basic)
+_ALLOWED_STATES = frozenset({
+    "New", "Active", "Under Consideration", "Proposed", "Approved", "Committed",
+    "In Progress", "Doing", "To Do", "Resolved", "Done", "Closed", "Removed",
+})
+# what the sync actually reads – a fraction of the `$expand=all` payload
+SYNC_FIELDS = ("System.Id", "System.Title", "System.State", "System.ChangedDate", "System.Rev")
+
+# bound once at import – the fetch helpers read plain module globals
+_settings = get_settings()
+MK_ORG, MK_PROJECT, MK_PAT = _settings.mk_ado_org, _settings.mk_ado_project, _settings.mk_ado_pat
+TM_ORG, TM_PROJECT, TM_PAT = _settings.tm_ado_org, _settings.tm_ado_project, _settings.tm_ado_pat
 
 # ───────────────────────── helpers ────────────────────────────
 
 
-def _auth_header(pat: str) -> dict[str, str]:
-    """
-    Azure DevOps PAT → Basic auth header.
-    Username may be blank; PAT goes in password slot.
+@lru_cache(maxsize=8)
+def _ado_headers(pat: str) -> Mapping[str, str]:
     """
-    from base64 import b64encode
+    Request headers for one Azure DevOps PAT.
+
+    • Basic auth – username may be blank; PAT goes in password slot.
+    • Compressed JSON – ADO gzips on request; httpx decompresses transparently.
 
+    Encoded once per PAT; the cached mapping is read-only.
+    """
     token = b64encode(f":{pat}".encode()).decode()
-    return {"Authorization": f"Basic {token}"}
+    return MappingProxyType({
+        "Authorization": f"Basic {token}",
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+    })
+
+
+def _retry_after(resp: Response) -> float | None:
+    """Seconds from a numeric Retry-After header (ADO sends it on 429/503)."""
+    try:
+        return float(resp.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
 
 
 async def _request_with_retry(
@@ -51,13 +92,23 @@ async def _request_with_retry(
     method: str,
     url: str,
     *,
-    headers: dict[str, str],
+    headers: Mapping[str, str],
     json_body: dict | None = None,
     max_retries: int = _MAX_RETRIES,
     timeout: float = 60.0,
 ) -> Response:
-    """HTTP with exponential jittered back-off on transient errors."""
+    """
+    HTTP with exponential full-jitter back-off on transient errors.
+
+    A server-sent Retry-After is honoured as the minimum wait.
+    Non-transient HTTP errors (e.g. 401/404) raise at once; the last
+    transient failure is raised without a trailing back-off sleep.
+    """
+    if max_retries < 1:
+        raise ValueError(f"max_retries must be >= 1, got {max_retries}")
+
     for attempt in range(1, max_retries + 1):
+        retry_after: float | None = None
         try:
             resp = await client.request(
                 method,
@@ -66,133 +117,256 @@ async def _request_with_retry(
                 json=json_body,
                 timeout=timeout,
             )
-
-            if resp.status_code not in _TRANSIENT:
-                resp.raise_for_status()
-                return resp
-
         except httpx.RequestError:
             # network / DNS error, treat as transient
-            pass
+            if attempt == max_retries:
+                raise
+        else:
+            if resp.status_code not in _TRANSIENT or attempt == max_retries:
+                resp.raise_for_status()
+                return resp
+            retry_after = _retry_after(resp)
 
-        # back-off – capped exponential with jitter
-        sleep = min(30.0, (2 ** (attempt - 1)) * random.uniform(0.8, 1.2))
+        # back-off – full jitter over a capped exponential window, so
+        # replicas retrying the same outage spread out instead of clustering
+        sleep = random.uniform(0, min(_MAX_BACKOFF, 2 ** (attempt - 1)))
+        if retry_after is not None:
+            sleep = max(sleep, retry_after)
         await asyncio.sleep(sleep)
 
-    # still failing
-    resp.raise_for_status()  # type: ignore  (resp guaranteed to exist)
+    raise AssertionError("unreachable – the last attempt returns or raises")
+
+
+_CLIENTS: dict[str, httpx.AsyncClient] = {}
+
+
+def _client(org: str) -> httpx.AsyncClient:
+    """
+    Lazily built, shared HTTP/2 client for one ADO organisation.
+
+    Concurrent chunk GETs multiplex on one connection and the pool
+    survives across sync cycles (no TLS handshake per call).
+    """
+    client = _CLIENTS.get(org)
+    if client is None or client.is_closed:
+        client = _CLIENTS[org] = httpx.AsyncClient(
+            base_url=f"https://dev.azure.com/{org}",
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=32,
+                max_keepalive_connections=16,
+                keepalive_expiry=300.0,   # outlive the default sync interval
+            ),
+        )
+    return client
+
+
+_LIMITERS: dict[str, asyncio.Semaphore] = {}
+
+
+def _limiter(client: httpx.AsyncClient) -> asyncio.Semaphore:
+    """
+    In-flight GET cap shared by every caller hitting the same organisation.
+
+    ADO throttles per org, so concurrent fetch_* calls must share one
+    budget rather than each getting _MAX_CONCURRENCY of their own.
+    """
+    key = str(client.base_url)
+    sem = _LIMITERS.get(key)
+    if sem is None:
+        sem = _LIMITERS[key] = asyncio.Semaphore(_MAX_CONCURRENCY)
+    return sem
+
+
+async def aclose_clients() -> None:
+    """Close every shared client – call once on application shutdown."""
+    clients = list(_CLIENTS.values())
+    _CLIENTS.clear()
+    _LIMITERS.clear()
+    await asyncio.gather(*(c.aclose() for c in clients))
 
 
 # ─────────── iterate IDs with WIQL pagination ────────────────
+def _quote(value: str) -> str:
+    """WIQL string literal – embedded single quotes are doubled."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+@lru_cache(maxsize=64)
+def _wiql_filter(work_item_type: str, states: tuple[str, ...] | None) -> str:
+    """
+    Static WHERE predicate for (type, states) – built and validated once per key.
+
+    The project comes from the `@project` macro (the WIQL URL is project-scoped).
+    """
+    if states and (unknown := set(states) - _ALLOWED_STATES):
+        raise ValueError(f"unsupported work-item state(s): {sorted(unknown)}")
+
+    where = f"[System.TeamProject] = @project AND [System.WorkItemType] = {_quote(work_item_type)}"
+    if states:
+        # one IN list – shorter than an OR chain and a single set lookup for ADO
+        where += f" AND [System.State] IN ({', '.join(map(_quote, states))})"
+    return where
+
+
 async def _iter_ids(
     client: httpx.AsyncClient,
-    org: str,
     project: str,
-    pat: str,
+    headers: Mapping[str, str],
     work_item_type: str,
     states: Sequence[str] | None = None,
-) -> AsyncIterator[int]:
+    changed_since: datetime | None = None,
+    after_id: int = 0,
+) -> AsyncIterator[list[int]]:
     """
-    Yield work-item IDs for a given type/state filter.
+    Yield IDs (ascending, one list per WIQL page) for a given type/state filter.
 
-    Uses continuationToken so it works for large result sets.
+    WIQL has no server-side paging – a result is simply cut at `$top` – so
+    pages are keyed on the last ID seen (`[System.Id] > last`). The next
+    page is already in flight while the current one is being consumed.
+    Only IDs above *after_id* are returned.
     """
-    # Build optional state clause
-    state_clause = ""
-    if states:
-        joined = " OR ".join(f"[System.State] = '{s}'" for s in states)
-        state_clause = f"AND ({joined})"
-
-    query = f"""
-        SELECT  [System.Id]
-        FROM    WorkItems
-        WHERE   [System.TeamProject] = '{project}'
-            AND [System.WorkItemType] = '{work_item_type}'
-            {state_clause}
-        ORDER BY [System.Id] ASC
-    """.strip()
-
-    body = {"query": query}
-    token: str | None = None
-    hdr = _auth_header(pat)
-
-    while True:
-        url = (
-            f"https://dev.azure.com/{org}/{project}/_apis/wit/wiql"
-            f"?$top={_ID_PAGE_SIZE}&api-version={_API_VER}"
-        )
-        if token:
-            url += f"&continuationToken={token}"
-
-        resp = await _request_with_retry(client, "POST", url, headers=hdr, json_body=body)
-        data = resp.json()
-
-        for wi in data.get("workItems", []):
-            yield wi["id"]
-
-        token = data.get("continuationToken")
-        if not token:
-            break
+    where = _wiql_filter(work_item_type, tuple(states) if states else None)
+    if changed_since:
+        # incremental sync – only items touched since the last watermark
+        where += f" AND [System.ChangedDate] >= '{changed_since:%Y-%m-%dT%H:%M:%SZ}'"
+
+    url = f"/{project}/_apis/wit/wiql?$top={_ID_PAGE_SIZE}&api-version={_API_VER}"
+    if changed_since:
+        url += "&timePrecision=true"  # else WIQL compares dates only
+
+    async def _page(last: int) -> list[int]:
+        body = {"query": _WIQL_TMPL.format(where=f"{where} AND [System.Id] > {last}")}
+        resp = await _request_with_retry(client, "POST", url, headers=headers, json_body=body)
+        return [wi["id"] for wi in orjson.loads(resp.content).get("workItems", ())]
+
+    pending: asyncio.Task | None = asyncio.create_task(_page(after_id))
+    try:
+        while pending is not None:
+            ids = await pending
+            # a full page may have more behind it – request page N+1 while
+            # the caller is still draining page N
+            pending = asyncio.create_task(_page(ids[-1])) if len(ids) >= _ID_PAGE_SIZE else None
+
+            if ids:
+                yield ids
+    finally:
+        if pending is not None:
+            pending.cancel()
 
 
 # ───────────── bulk-fetch full work-item docs ────────────────
-async def _fetch_items(
+async def _iter_items(
     client: httpx.AsyncClient,
-    org: str,
     project: str,
-    pat: str,
-    ids: list[int],
-) -> list[dict]:
-    hdr = _auth_header(pat)
-    out: list[dict] = []
-
-    for i in range(0, len(ids), _BATCH_CHUNK):
-        block = ",".join(map(str, ids[i : i + _BATCH_CHUNK]))
+    headers: Mapping[str, str],
+    pages: AsyncIterator[list[int]],
+    fields: Sequence[str] | None = None,
+) -> AsyncIterator[tuple[int, list[dict]]]:
+    """
+    Stream `(cursor, items)` batches while WIQL *pages* are still arriving.
+
+    Every full chunk is dispatched as soon as it is buffered, so the
+    work-item GETs overlap with the remaining WIQL pages. Batches are
+    yielded in ID order; at most _MAX_CONCURRENCY are held at once, so
+    memory stays O(a few chunks) whatever the result size.
+
+    *cursor* is the highest ID requested for this batch – once it and all
+    earlier batches are stored, a pass can resume with `after_id=cursor`.
+
+    *fields* limits each item to those fields; None fetches `$expand=all`
+    (relations etc. – ADO rejects `fields` combined with `$expand`).
+    """
+    sem = _limiter(client)
+    select = f"fields={','.join(fields)}" if fields else "$expand=all"
+
+    async def _one(block_ids: list[int]) -> list[dict]:
+        block = ",".join(map(str, block_ids))
         url = (
-            f"https://dev.azure.com/{org}/{project}/_apis/wit/workitems"
-            f"?ids={block}&$expand=all&api-version={_API_VER}"
+            f"/{project}/_apis/wit/workitems"
+            f"?ids={block}&{select}&api-version={_API_VER}"
         )
-        resp = await _request_with_retry(client, "GET", url, headers=hdr)
-        out.extend(resp.json().get("value", []))
-
-    return out
+        async with sem:
+            resp = await _request_with_retry(client, "GET", url, headers=headers)
+        return orjson.loads(resp.content).get("value", [])
+
+    # chunks are independent – overlap their round-trips
+    pending: deque[tuple[asyncio.Task, int]] = deque()   # (GET, its last ID)
+    buf: list[int] = []
+
+    def _dispatch(block: list[int]) -> None:
+        pending.append((asyncio.create_task(_one(block)), block[-1]))
+
+    try:
+        async for page in pages:
+            buf.extend(page)
+            while len(buf) >= _BATCH_CHUNK:
+                _dispatch(buf[:_BATCH_CHUNK])
+                buf = buf[_BATCH_CHUNK:]
+            # hand over finished batches early; block once the window is full
+            while pending and (pending[0][0].done() or len(pending) >= _MAX_CONCURRENCY):
+                task, last = pending.popleft()
+                yield last, await task
+        if buf:
+            _dispatch(buf)
+        while pending:
+            task, last = pending.popleft()
+            yield last, await task
+    finally:
+        for t, _ in pending:
+            t.cancel()
 
 
 # ───────────── public convenience wrappers ───────────────────
-async def fetch_mk_feature_requests(states: Sequence[str] | None = None) -> list[dict]:
-    """Return full MK Feature-Request docs matching *states*."""
-    org = settings.mk_ado_org
-    project = settings.mk_ado_project
-    pat = settings.mk_ado_pat
-
-    async with httpx.AsyncClient() as client:
-        ids = [
-            wid
-            async for wid in _iter_ids(
-                client, org, project, pat, work_item_type="Feature Request", states=states
-            )
-        ]
-        if not ids:
-            return []
-
-        return await _fetch_items(client, org, project, pat, ids)
+async def fetch_mk_feature_requests(
+    states: Sequence[str] | None = None,
+    changed_since: datetime | None = None,
+    *,
+    client: httpx.AsyncClient | None = None,
+    fields: Sequence[str] | None = SYNC_FIELDS,
+    after_id: int = 0,
+) -> AsyncIterator[tuple[int, list[dict]]]:
+    """
+    Yield `(cursor, docs)` batches of MK Feature-Request docs matching *states*
+    (changed since *changed_since*).
 
+    Once a batch is stored, *cursor* may be passed back as *after_id*
+    (same *states* / *changed_since*) to continue after a restart.
+    *client* (base_url = the MK organisation) defaults to the shared one.
+    """
+    client = client or _client(MK_ORG)
+    hdr = _ado_headers(MK_PAT)   # built once, shared by every page / chunk request
+    pages = _iter_ids(
+        client, MK_PROJECT, hdr, work_item_type="Feature Request", states=states,
+        changed_since=changed_since, after_id=after_id,
+    )
+    async for batch in _iter_items(client, MK_PROJECT, hdr, pages, fields):
+        yield batch
 
-async def fetch_tm_epics(states: Sequence[str] | None = None) -> list[dict]:
-    """Return full TM Epic docs matching *states*."""
-    org = settings.tm_ado_org
-    project = settings.tm_ado_project
-    pat = settings.tm_ado_pat
 
-    async with httpx.AsyncClient() as client:
-        ids = [
-            wid
-            async for wid in _iter_ids(
-                client, org, project, pat, work_item_type="Epic", states=states
-            )
-        ]
-        if not ids:
-            return []
+async def fetch_tm_epics(
+    states: Sequence[str] | None = None,
+    changed_since: datetime | None = None,
+    *,
+    client: httpx.AsyncClient | None = None,
+    fields: Sequence[str] | None = SYNC_FIELDS,
+    after_id: int = 0,
+) -> AsyncIterator[tuple[int, list[dict]]]:
+    """
+    Yield `(cursor, docs)` batches of TM Epic docs matching *states*
+    (changed since *changed_since*).
 
-        return await _fetch_items(client, org, project, pat, ids)
+    Once a batch is stored, *cursor* may be passed back as *after_id*
+    (same *states* / *changed_since*) to continue after a restart.
+    *client* (base_url = the TM organisation) defaults to the shared one.
+    """
+    client = client or _client(TM_ORG)
+    hdr = _ado_headers(TM_PAT)   # built once, shared by every page / chunk request
+    pages = _iter_ids(
+        client, TM_PROJECT, hdr, work_item_type="Epic", states=states,
+        changed_since=changed_since, after_id=after_id,
+    )
+    async for batch in _iter_items(client, TM_PROJECT, hdr, pages, fields):
+        yield batch
 
@@ -8,21 +8,35 @@ from motor.motor_asyncio import AsyncIOMotorClient
 
 from ..core.config import get_settings
 
-settings = get_settings()
-
 
 @lru_cache            # 1 global singleton – avoids reconnect churn
 def get_client() -> AsyncIOMotorClient:
     """
     Return a cached Motor client.
 
+    • settings are read on first use, not at import (no config needed
+      just to import this module).
     • settings.mongo_uri is a pydantic MongoDsn → cast to str.
     • uuidRepresentation="standard" keeps UUIDs driver-default.
     """
-    return AsyncIOMotorClient(str(settings.mongo_uri), uuidRepresentation="standard")
+    return AsyncIOMotorClient(str(get_settings().mongo_uri), uuidRepresentation="standard")
 
 
 def get_db():
     """Convenience accessor for the default database specified in the URI."""
     return get_client().get_default_database()
 
+
+async def ensure_indexes() -> None:
+    """
+    Create the indexes the hot queries rely on.
+
+    create_index is idempotent, so this is safe to run on every start.
+    • users.email – unique; login / register look users up by e-mail.
+    • mk_feature_requests.mk_id – unique; the sync upserts filter on it.
+    • mk_feature_requests (state, last_updated desc) – dashboard listing.
+    """
+    db = get_db()
+    await db.users.create_index("email", unique=True)
+    await db.mk_feature_requests.create_index("mk_id", unique=True)
+    await db.mk_feature_requests.create_index([("state", 1), ("last_updated", -1)])
@@ -1,27 +1,72 @@
-import asyncio, logging
-from datetime import datetime
+import asyncio, logging, random, time
+from datetime import datetime, timedelta, timezone
+from pymongo import UpdateOne
 from ..core.config import get_settings
 from .ado_client import fetch_mk_feature_requests
 from .database import get_db
 settings = get_settings()
 log = logging.getLogger("sync_daemon")
+# sync_meta key of the MK FR watermark – scoped to org/project/type so a config change forces a full pull
+_MK_FR_WATERMARK = f"{settings.mk_ado_org}/{settings.mk_ado_project}/Feature Request"
+# re-scan this much before the watermark – ADO indexes ChangedDate with some lag;
+# the overlap's repeats are cheap because unchanged revs are not rewritten
+_WATERMARK_OVERLAP = timedelta(minutes=5)
+_BULK_CHUNK = 1000   # ops per bulk_write – far below Mongo's 16 MB message cap
+# in-flight pass: highest stored ID + the since/started it belongs to, saved per flush
+_MK_FR_CURSOR = f"{_MK_FR_WATERMARK}/cursor"
+async def _flush(db, ops) -> int:
+    res = await db.mk_feature_requests.bulk_write(ops, ordered=False)
+    return res.upserted_count + res.modified_count
 async def sync_once():
-    frs = await fetch_mk_feature_requests(["New", "Active", "Under Consideration"])
-    if not frs:
-        log.info("No FRs")
-        return
     db = get_db()
-    for fr in frs:
-        mk_id = fr["id"]
-        await db.mk_feature_requests.update_one({"mk_id": mk_id},
-            {"$set": {"mk_id": mk_id, "title": fr['fields']['System.Title'],
-                      "state": fr['fields']['System.State'], "last_updated": datetime.utcnow()}},
-            upsert=True)
-    log.info("Synced %d FRs", len(frs))
+    cur = await db.sync_meta.find_one({"_id": _MK_FR_CURSOR})
+    if cur:   # resume an interrupted pass – same filter, IDs above the stored ones
+        run_started, since, after_id = cur["started"].replace(tzinfo=timezone.utc), cur["since"], cur["after_id"]
+        if since: since = since.replace(tzinfo=timezone.utc)
+        log.info("Resuming FR sync from saved cursor")
+    else:
+        run_started, after_id = datetime.now(timezone.utc), 0
+        meta = await db.sync_meta.find_one({"_id": _MK_FR_WATERMARK})
+        since = meta["ts"] - _WATERMARK_OVERLAP if meta else None   # None → first run, full pull
+    n, changed, ops, saved, cursor = 0, 0, [], after_id, after_id
+    async def _checkpoint():
+        nonlocal changed, ops, saved
+        changed += await _flush(db, ops)
+        ops = []
+        if cursor != saved:   # every ID up to *cursor* is stored now
+            await db.sync_meta.update_one({"_id": _MK_FR_CURSOR}, {"$set": {
+                "after_id": cursor, "since": since, "started": run_started}}, upsert=True)
+            saved = cursor
+    # streamed – FRs are written in unordered bulk batches as they arrive
+    async for cursor, batch in fetch_mk_feature_requests(
+            ["New", "Active", "Under Consideration"], changed_since=since, after_id=after_id):
+        for fr in batch:
+            mk_id, rev = fr["id"], fr["rev"]
+            doc = {"title": fr['fields']['System.Title'], "state": fr['fields']['System.State'],
+                   "rev": rev, "last_updated": run_started}
+            # insert if new; otherwise write only when ADO's rev moved, so unchanged
+            # FRs cost no write / oplog entry (both ops are correct in any order)
+            ops.append(UpdateOne({"mk_id": mk_id}, {"$setOnInsert": doc}, upsert=True))
+            ops.append(UpdateOne({"mk_id": mk_id, "rev": {"$ne": rev}}, {"$set": doc}))
+        n += len(batch)
+        if len(ops) >= _BULK_CHUNK:
+            await _checkpoint()
+    if ops:
+        changed += await _flush(db, ops)
+    # advance only after every FR is stored, so a failed run is retried in full
+    await db.sync_meta.update_one({"_id": _MK_FR_WATERMARK}, {"$set": {"ts": run_started}}, upsert=True)
+    await db.sync_meta.delete_one({"_id": _MK_FR_CURSOR})
+    if n: log.info("Synced %d FRs (%d new or changed)", n, changed)
+    else: log.info("No FRs")
 async def run_sync_loop():
-    interval = int(getattr(settings, "sync_poll_interval", 300))
+    interval = settings.sync_poll_interval
+    # fixed-rate: runs start every `interval` from the first one, however long a sync
+    # takes; the jitter keeps replicas from hitting the ADO org's rate limit together
+    next_at = time.monotonic()
     while True:
-        try: await sync_once()
+        try: await asyncio.wait_for(sync_once(), timeout=interval * 3)   # a hung ADO call can't stall the loop
         except Exception as e:
             log.error("sync error %s", e, exc_info=True)
-        await asyncio.sleep(interval)
+        next_at += interval
+        if next_at < time.monotonic(): next_at = time.monotonic()   # overran – skip missed slots, don't burst
+        await asyncio.sleep(next_at - time.monotonic() + random.uniform(0, interval * 0.1))
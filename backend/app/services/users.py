@@ -3,14 +3,21 @@ User-centric helpers:
 • create_user          – register a new user
 • authenticate_user    – validate credentials
 • create_tokens        – issue JWT access/refresh tokens
+• refresh_tokens       – trade a refresh-token for a fresh pair
+• revoke_tokens        – invalidate every outstanding refresh-token of a user
+• find_active_user     – active user doc by JWT `sub`
 """
 
+import secrets
 from datetime import datetime, timedelta, timezone
 
-from jose import jwt
-from passlib.context import CryptContext
+from bson import ObjectId
+from fastapi import HTTPException, status
+from pymongo.errors import DuplicateKeyError
+import jwt
 
 from ..core.config import get_settings
+from ..core.security import ALGORITHM, JWT_KEY, ahash_password, averify_password, hash_password, needs_rehash
 from ..models.user import UserCreate, UserOut
 from ..models.auth import LoginRequest  # just for type hints
 from ..models.user import Token
@@ -19,68 +26,128 @@ from .database import get_db
 settings = get_settings()
 
 # ────────────────────────── password hashing ───────────────────────────
-pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# hashing itself lives in core.security (shared with routers/users.py)
 
-
-def _hash(pw: str) -> str:
-    return pwd_ctx.hash(pw)
-
-
-def _verify(pw: str, hashed: str) -> bool:
-    return pwd_ctx.verify(pw, hashed)
+# verified against when the e-mail is unknown, so a miss costs one bcrypt
+# round just like a wrong password (no user-enumeration timing oracle)
+_DUMMY_HASH = hash_password("!" * 16)
 
 
 # ────────────────────────── JWT helpers ────────────────────────────────
-def _jwt_encode(claims: dict, expires: int) -> str:
+def _jwt_encode(claims: dict, expires: int, *, now: datetime) -> str:
     payload = {
         **claims,
-        "exp": datetime.now(timezone.utc) + timedelta(seconds=expires),
-        "iat": datetime.now(timezone.utc),
+        "exp": now + timedelta(seconds=expires),
+        "iat": now,
     }
-    return jwt.encode(payload, settings.jwt_secret, algorithm="HS256")
+    return jwt.encode(payload, JWT_KEY, algorithm=ALGORITHM)
 
 
 def create_tokens(user: UserOut) -> Token:
     """
     Produce both access- and refresh-tokens for a given user doc.
+
+    Refresh-tokens are stateless: validity is the signature + `exp`, and
+    revocation is the per-user `token_version` they carry as `ver`.
     """
     base_claims = {"sub": user.id, "email": user.email, "role": user.role}
+    refresh_claims = {
+        **base_claims,
+        "type": "refresh",
+        "jti": secrets.token_urlsafe(16),
+        "ver": user.token_version,
+    }
+    now = datetime.now(timezone.utc)  # one clock read – both tokens share iat
     return Token(
-        access_token=_jwt_encode(base_claims, settings.jwt_access_expires),
-        refresh_token=_jwt_encode(base_claims, settings.jwt_refresh_expires),
+        access_token=_jwt_encode(base_claims, settings.jwt_access_expires, now=now),
+        refresh_token=_jwt_encode(refresh_claims, settings.jwt_refresh_expires, now=now),
         expires_in=settings.jwt_access_expires,
     )
 
 
+async def refresh_tokens(refresh_token: str) -> Token | None:
+    """
+    Returns a new token pair if *refresh_token* is valid and not revoked, else None.
+    """
+    try:
+        payload = jwt.decode(
+            refresh_token,
+            JWT_KEY,
+            algorithms=[ALGORITHM],
+            options={"require": ["exp", "iat", "sub"]},
+        )
+    except jwt.PyJWTError:
+        return None
+    if payload.get("type") != "refresh":
+        return None
+
+    doc = await find_active_user(payload["sub"])
+    if not doc:
+        return None
+    # exact match – every logout bumps the version, whatever the clock says
+    if payload.get("ver", 0) != doc.get("token_version", 0):
+        return None
+
+    return create_tokens(_to_user_out(doc))
+
+
+async def revoke_tokens(user_id) -> None:
+    """
+    Invalidates every refresh-token issued to *user_id* so far (one field write).
+    """
+    db = get_db()
+    await db.users.update_one({"_id": user_id}, {"$inc": {"token_version": 1}})
+
+
 # ────────────────────────── CRUD helpers ───────────────────────────────
 async def _find_user_by_email(email: str):
     db = get_db()
     return await db.users.find_one({"email": email})
 
 
-async def create_user(payload: UserCreate) -> UserOut:
+async def find_active_user(user_id: str, projection: dict | None = None):
     """
-    Inserts a new user document (throws 409 if e-mail already exists).
+    Active user by JWT `sub` – ObjectId ids (registered users) arrive as str.
     """
     db = get_db()
+    _id = ObjectId(user_id) if ObjectId.is_valid(user_id) else user_id
+    return await db.users.find_one({"_id": _id, "active": True}, projection=projection)
 
-    if await _find_user_by_email(payload.email):
-        from fastapi import HTTPException, status
 
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="E-mail already registered",
-        )
+def _to_user_out(doc: dict) -> UserOut:
+    return UserOut(
+        id=str(doc["_id"]),
+        email=doc["email"],
+        name=doc["name"],
+        role=doc["role"],
+        created_at=doc["created_at"],
+        active=doc["active"],
+        token_version=doc.get("token_version", 0),
+    )
+
+
+async def create_user(payload: UserCreate) -> UserOut:
+    """
+    Inserts a new user document (throws 409 if e-mail already exists).
+    """
+    db = get_db()
 
     doc = {
         "email": payload.email,
         "name": payload.name,
         "role": payload.role,
-        "hashed_pw": _hash(payload.password),
+        "password_hash": await ahash_password(payload.password),
         "created_at": datetime.now(timezone.utc),
         "active": True,
     }
-    res = await db.users.insert_one(doc)
+    try:
+        # unique users.email index – one round-trip instead of find + insert
+        res = await db.users.insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="E-mail already registered",
+        ) from None
     return UserOut(
         id=str(res.inserted_id),
         email=doc["email"],
@@ -96,15 +163,16 @@ async def authenticate_user(email: str, password: str) -> UserOut | None:
     Returns the user doc if credentials are valid, else None.
     """
     doc = await _find_user_by_email(email)
-    if not doc or not _verify(password, doc["hashed_pw"]):
+    # "hashed_pw" – legacy field name written by older create_user versions
+    hashed = (doc.get("password_hash") or doc.get("hashed_pw")) if doc else _DUMMY_HASH
+    if not await averify_password(password, hashed) or not doc:
         return None
 
-    return UserOut(
-        id=str(doc["_id"]),
-        email=doc["email"],
-        name=doc["name"],
-        role=doc["role"],
-        created_at=doc["created_at"],
-        active=doc["active"],
-    )
+    if needs_rehash(hashed) or "hashed_pw" in doc:
+        # only moment the plain password is at hand – bring the hash to the current cost
+        await get_db().users.update_one(
+            {"_id": doc["_id"]},
+            {"$set": {"password_hash": await ahash_password(password)}, "$unset": {"hashed_pw": ""}},
+        )
+    return _to_user_out(doc)
 
@@ -0,0 +1,93 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from pymongo.errors import DuplicateKeyError
+
+# Settings are read at import time – give them just enough to load
+for _k, _v in {
+    "JWT_SECRET": "x" * 32, "BCRYPT_ROUNDS": "4",
+    "MK_ADO_ORG": "mk", "MK_ADO_PROJECT": "p", "MK_ADO_PAT": "pat",
+    "TM_ADO_ORG": "tm", "TM_ADO_PROJECT": "p", "TM_ADO_PAT": "pat",
+    "SMTP_HOST": "smtp", "SMTP_USER": "u", "SMTP_PASS": "p",
+}.items():
+    os.environ.setdefault(_k, _v)
+
+from app.main import app  # noqa: E402
+from app.services import sync_daemon, users as users_service  # noqa: E402
+
+
+class _Collection:
+    """In-memory stand-in for the handful of motor calls the app makes."""
+
+    def __init__(self, unique: str | None = None):
+        self.docs: list[dict] = []
+        self.unique = unique
+
+    def _match(self, doc, flt):
+        return all(
+            doc.get(k) != v["$ne"] if isinstance(v, dict) else doc.get(k) == v
+            for k, v in flt.items()
+        )
+
+    def _update(self, flt, update, upsert=False) -> str | None:
+        doc = next((d for d in self.docs if self._match(d, flt)), None)
+        if doc is None:
+            if not upsert:
+                return None
+            doc = {k: v for k, v in flt.items() if not isinstance(v, dict)}
+            doc.setdefault("_id", ObjectId())
+            doc.update(update.get("$setOnInsert", {}))
+            self.docs.append(doc)
+            status = "upserted"
+        else:
+            status = "modified"
+        doc.update(update.get("$set", {}))
+        for k, n in update.get("$inc", {}).items():
+            doc[k] = doc.get(k, 0) + n
+        for k in update.get("$unset", {}):
+            doc.pop(k, None)
+        return status
+
+    async def find_one(self, flt, projection=None):
+        return next((dict(d) for d in self.docs if self._match(d, flt)), None)
+
+    async def insert_one(self, doc):
+        if self.unique and any(d[self.unique] == doc[self.unique] for d in self.docs):
+            raise DuplicateKeyError(self.unique)
+        doc["_id"] = ObjectId()
+        self.docs.append(doc)
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def update_one(self, flt, update, upsert=False):
+        self._update(flt, update, upsert)
+
+    async def delete_one(self, flt):
+        self.docs = [d for d in self.docs if not self._match(d, flt)]
+
+    async def bulk_write(self, ops, ordered=True):
+        res = [self._update(op._filter, op._doc, op._upsert) for op in ops]
+        return SimpleNamespace(upserted_count=res.count("upserted"), modified_count=res.count("modified"))
+
+
+class _DB:
+    def __init__(self):
+        self.users = _Collection(unique="email")
+        self.sync_meta = _Collection()
+        self.mk_feature_requests = _Collection()
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = _DB()
+    monkeypatch.setattr(users_service, "get_db", lambda: db)
+    monkeypatch.setattr(sync_daemon, "get_db", lambda: db)
+    return db
+
+
+@pytest.fixture
+def client(db):
+    # no `with` – startup hooks (indexes, ADO sync loop) are not run
+    return TestClient(app)
@@ -0,0 +1,49 @@
+import bcrypt
+
+from app.core.security import _ROUNDS
+
+USER = {"email": "pm@example.com", "name": "PM", "role": "MK PM", "password": "s3cret-pass"}
+
+
+def _login(client):
+    assert client.post("/auth/register", json=USER).status_code == 201
+    resp = client.post("/auth/login", data={"username": USER["email"], "password": USER["password"]})
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_logout_registered_user(client):
+    tokens = _login(client)
+    resp = client.post("/auth/logout", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert resp.status_code == 204
+
+
+def test_refresh_rejected_after_logout(client):
+    # logout in the same second as the login must still revoke its refresh-token
+    tokens = _login(client)
+    client.post("/auth/logout", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    resp = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 401
+
+
+def test_refresh_after_relogin(client):
+    # logout, then a new login in (most likely) the same second – only the old pair is revoked
+    tokens = _login(client)
+    client.post("/auth/logout", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    resp = client.post("/auth/login", data={"username": USER["email"], "password": USER["password"]})
+    resp = client.post("/auth/refresh", json={"refresh_token": resp.json()["refresh_token"]})
+    assert resp.status_code == 200
+
+
+def test_register_hides_token_version(client):
+    resp = client.post("/auth/register", json=USER)
+    assert "token_version" not in resp.json()
+
+
+def test_login_rehashes_at_current_cost(client, db):
+    client.post("/auth/register", json=USER)
+    user = db.users.docs[0]
+    user["password_hash"] = bcrypt.hashpw(USER["password"].encode(), bcrypt.gensalt(rounds=_ROUNDS + 1)).decode()
+    resp = client.post("/auth/login", data={"username": USER["email"], "password": USER["password"]})
+    assert resp.status_code == 200
+    assert user["password_hash"].startswith(f"$2b${_ROUNDS:02d}$")
@@ -0,0 +1,96 @@
+import asyncio
+import re
+
+import httpx
+import orjson
+import pytest
+
+from app.services import ado_client, sync_daemon
+
+N_ITEMS = 50
+
+
+class _FakeADO:
+    """WIQL keyed on `[System.Id] > n` + `$top`, work-item GETs by ids; may fail one GET."""
+
+    def __init__(self, fail_id: int | None = None):
+        self.fail_id = fail_id
+        self.wiql_after: list[int] = []
+        self.get_blocks: list[list[int]] = []
+
+    def __call__(self, req: httpx.Request) -> httpx.Response:
+        if req.url.path.endswith("/wiql"):
+            query = orjson.loads(req.content)["query"]
+            after = int(re.search(r"\[System.Id\] > (\d+)", query)[1])
+            top = int(req.url.params["$top"])
+            self.wiql_after.append(after)
+            ids = range(after + 1, min(after + top, N_ITEMS) + 1)
+            return httpx.Response(200, json={"workItems": [{"id": i} for i in ids]})
+        ids = [int(i) for i in req.url.params["ids"].split(",")]
+        self.get_blocks.append(ids)
+        if self.fail_id in ids:
+            return httpx.Response(404)
+        value = [{"id": i, "rev": 1, "fields": {"System.Title": f"FR {i}", "System.State": "New"}} for i in ids]
+        return httpx.Response(200, json={"value": value})
+
+
+@pytest.fixture
+def ado(monkeypatch):
+    # page and chunk sizes that don't line up (7 vs 5), 2 batches per bulk flush
+    monkeypatch.setattr(ado_client, "_ID_PAGE_SIZE", 7)
+    monkeypatch.setattr(ado_client, "_BATCH_CHUNK", 5)
+    monkeypatch.setattr(sync_daemon, "_BULK_CHUNK", 20)
+    fake = _FakeADO()
+    client = httpx.AsyncClient(base_url="https://ado.test/mk", transport=httpx.MockTransport(fake))
+    monkeypatch.setitem(ado_client._CLIENTS, ado_client.MK_ORG, client)
+    monkeypatch.setattr(ado_client, "_LIMITERS", {})   # semaphores bind to the loop of each asyncio.run
+    return fake
+
+
+def _cursor(db):
+    return next((dict(d) for d in db.sync_meta.docs if d["_id"] == sync_daemon._MK_FR_CURSOR), None)
+
+
+def _stored_ids(db):
+    return sorted(d["mk_id"] for d in db.mk_feature_requests.docs)
+
+
+def test_batches_follow_id_order_across_unaligned_pages(ado):
+    async def _collect():
+        return [b async for b in ado_client.fetch_mk_feature_requests()]
+
+    batches = asyncio.run(_collect())
+    ids = [item["id"] for _, batch in batches for item in batch]
+    assert ids == list(range(1, N_ITEMS + 1))
+    assert all(len(block) == 5 for block in ado.get_blocks)
+    # cursor = highest ID handed over so far
+    assert [cursor for cursor, _ in batches] == [batch[-1]["id"] for _, batch in batches]
+    assert ado.wiql_after == list(range(0, N_ITEMS, 7))
+
+
+def test_failed_get_keeps_cursor_within_stored_batches(ado, db):
+    ado.fail_id = 33
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(sync_daemon.sync_once())
+
+    cursor = _cursor(db)
+    assert cursor is not None and cursor["after_id"] < 33
+    assert set(range(1, cursor["after_id"] + 1)) <= set(_stored_ids(db))
+    # the pass did not finish – the watermark must not move
+    assert all(d["_id"] != sync_daemon._MK_FR_WATERMARK for d in db.sync_meta.docs)
+
+
+def test_resumed_pass_finishes_and_clears_cursor(ado, db):
+    ado.fail_id = 33
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(sync_daemon.sync_once())
+    saved = _cursor(db)
+
+    ado.fail_id, ado.wiql_after = None, []
+    asyncio.run(sync_daemon.sync_once())
+
+    assert ado.wiql_after[0] == saved["after_id"]
+    assert _stored_ids(db) == list(range(1, N_ITEMS + 1))
+    assert _cursor(db) is None
+    watermark = next(d for d in db.sync_meta.docs if d["_id"] == sync_daemon._MK_FR_WATERMARK)
+    assert watermark["ts"] == saved["started"]   # the interrupted pass's start, not the resume's